@@ -1,8 +1,36 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
 
 from utilities.constants import BittrexConstants, OrderStatus
-from utilities.time import convert_bittrex_timestamp_to_datetime, utc_to_local
+from utilities.time import convert_bittrex_timestamp_to_local
+
+SATOSHI = BittrexConstants.SATOSHI
+UNEXECUTED_STATUS = OrderStatus.UNEXECUTED
+COMPLETED_STATUS = OrderStatus.COMPLETED
+
+# Net total of a filled order from its price and commission, keyed by Bittrex order type
+TOTAL_FUNCTIONS = {
+    'LIMIT_BUY': lambda price, commission: -1 * (price + commission),
+    'LIMIT_SELL': lambda price, commission: price - commission
+}
+
+
+def to_satoshi(value):
+    """
+    Convert a Bittrex float amount to an integer number of satoshi (1e-8).
+    :param value: (float)
+    :return: (int)
+    """
+    return round(value * SATOSHI)
+
+
+def from_satoshi(value):
+    """
+    Convert an integer number of satoshi to a Decimal with 8 decimal places.
+    :param value: (int)
+    :return: (Decimal)
+    """
+    return Decimal(value).scaleb(-8)
 
 
 class BittrexOrder:
@@ -10,6 +38,10 @@ class BittrexOrder:
     Wrapper for a bittrex order
     """
 
+    __slots__ = ('market', 'type', 'target_price', 'target_quantity', 'base_quantity', 'current_quantity',
+                 'final_quantity', 'status', 'uuid', 'open_time', 'closed_time', 'actual_price', 'current_total',
+                 'final_total')
+
     def __init__(self,
                  market=None,
                  order_type=None,
@@ -20,7 +52,7 @@ class BittrexOrder:
                  final_quantity=0,
                  open_time=None,
                  closed_time=None,
-                 status=OrderStatus.UNEXECUTED.name,
+                 status=UNEXECUTED_STATUS,
                  uuid=None,
                  actual_price=0,
                  current_total=0,
@@ -43,18 +75,49 @@ class BittrexOrder:
         self.current_total = current_total
         self.final_total = final_total
 
-    @staticmethod
-    def create(order):
+    @classmethod
+    def create(cls, order):
         """
         Create a BittrexOrder from an order
         :param order:
         :return:
         """
 
-        new_order = BittrexOrder(market=order.get('market'),
-                                 order_type=order.get('type'),
-                                 target_quantity=order.get('target_quantity'),
-                                 base_quantity=order.get('base_quantity'))
+        return cls.from_fields(order.get('market'),
+                               order.get('type'),
+                               order.get('target_quantity'),
+                               order.get('base_quantity'))
+
+    @classmethod
+    def from_fields(cls, market, order_type, target_quantity, base_quantity):
+        """
+        Create a BittrexOrder from order fields
+
+        Bypasses __init__ and sets every slot directly since only four fields are given.
+        :param market:
+        :param order_type:
+        :param target_quantity:
+        :param base_quantity:
+        :return:
+        """
+
+        new_order = object.__new__(cls)
+
+        new_order.market = market
+        new_order.type = order_type
+        new_order.target_price = 0
+        new_order.target_quantity = target_quantity
+        new_order.base_quantity = base_quantity
+        new_order.current_quantity = 0
+        new_order.final_quantity = 0
+        new_order.status = UNEXECUTED_STATUS
+
+        new_order.uuid = None
+        new_order.open_time = None
+        new_order.closed_time = None
+        new_order.actual_price = 0
+        new_order.current_total = 0
+        new_order.final_total = 0
 
         return new_order
 
@@ -92,28 +155,28 @@ class BittrexOrder:
         """
 
         closed_time = order.get('Closed')
-        order_type = order.get('Type')
+        order_type = order['Type']
 
-        self.open_time = utc_to_local(convert_bittrex_timestamp_to_datetime(order.get('Opened')))
-        self.current_quantity = (Decimal(order.get('Quantity')) - Decimal(order.get('QuantityRemaining'))).quantize(
-            BittrexConstants.DIGITS)
+        self.open_time = convert_bittrex_timestamp_to_local(order['Opened'])
+        self.current_quantity = from_satoshi(to_satoshi(order['Quantity']) - to_satoshi(order['QuantityRemaining']))
 
-        try:
-            self.actual_price = Decimal(order.get('PricePerUnit')).quantize(BittrexConstants.DIGITS)
-        except TypeError:
-            pass
+        # PricePerUnit is None until part of the order is filled
+        price_per_unit = order.get('PricePerUnit')
 
-        if closed_time:
-            self.closed_time = utc_to_local(convert_bittrex_timestamp_to_datetime(closed_time))
+        if price_per_unit is not None:
+            self.actual_price = from_satoshi(to_satoshi(price_per_unit))
+
+        # Closed is None while the order is still open
+        if closed_time is not None:
+            self.closed_time = convert_bittrex_timestamp_to_local(closed_time)
         else:
-            self.closed_time = datetime.now().astimezone(tz=None)
+            self.closed_time = datetime.now(timezone.utc).astimezone()
+
+        total_function = TOTAL_FUNCTIONS.get(order_type)
 
-        if order_type == 'LIMIT_BUY':
-            self.current_total = -1 * (Decimal(order.get('Price')) + Decimal(order.get('CommissionPaid'))).quantize(
-                BittrexConstants.DIGITS)
-        elif order_type == 'LIMIT_SELL':
-            self.current_total = (Decimal(order.get('Price')) - Decimal(order.get('CommissionPaid'))).quantize(
-                BittrexConstants.DIGITS)
+        if total_function:
+            self.current_total = from_satoshi(total_function(to_satoshi(order['Price']),
+                                                             to_satoshi(order['CommissionPaid'])))
 
     def complete_order(self):
         """
@@ -121,6 +184,6 @@ class BittrexOrder:
         :return:
         """
 
-        self.status = OrderStatus.COMPLETED.name
+        self.status = COMPLETED_STATUS
         self.final_quantity += self.current_quantity
         self.final_total += self.current_total
@@ -1,8 +1,19 @@
-from hmac import new as hmac_new
-from hashlib import sha512
-from requests import get
+from functools import partial
+from hmac import digest as hmac_digest
+from operator import itemgetter
+from random import random
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
 from time import time, sleep
-from urllib.parse import urlencode
+from urllib.parse import quote_plus
+
+from utilities.network import backoff
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 BUY_ORDERBOOK = 'buy'
 SELL_ORDERBOOK = 'sell'
@@ -36,13 +47,52 @@ BASE_URL_V2_0 = 'https://bittrex.com/api/v2.0{path}?'
 PROTECTION_PUB = 'pub'  # public methods
 PROTECTION_PRV = 'prv'  # authenticated methods
 
+# Option names for the same parameter under each API version: (v1.1, v2.0)
+OPTION_ALIASES = (('market', 'marketname'), ('uuid', 'orderid'), ('currency', 'currencyname'))
+
+# Increasing waits (seconds) for a new order to close, same 3 s total as a single fixed wait
+ORDER_SETTLE_DELAYS = (0.5, 1.0, 1.5)
+
+# Characters quote_plus never escapes
+URL_SAFE_CHARACTERS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~')
+
+# (connect, read) timeouts in seconds for Bittrex API calls
+REQUEST_TIMEOUT = (3.05, 10)
+
+
+def create_session(pool_connections=10, pool_maxsize=20):
+    """
+    Create a requests session that keeps connections to Bittrex alive between API calls
+    (no TCP/TLS handshake per request).
+    :param pool_connections: Number of host connection pools to cache
+    :param pool_maxsize: Maximum connections kept per pool
+    :return: (Session)
+    """
+    session = Session()
+    session.mount('https://', HTTPAdapter(pool_connections=pool_connections,
+                                          pool_maxsize=pool_maxsize,
+                                          max_retries=0))
+
+    return session
+
 
-def using_requests(request_url, apisign):
+# Columns of a price table row
+ENTRY_FIELDS = ('time', 'price', 'wprice', 'base_volume', 'buy_volume', 'sell_volume', 'buy_order', 'sell_order')
+ENTRY_GETTER = itemgetter(*ENTRY_FIELDS)
 
-    return get(
-        request_url,
-        headers={"apisign": apisign}
-    ).json()
+
+def using_requests(request_url, apisign, session):
+
+    response = session.get(request_url, headers={"apisign": apisign}, timeout=REQUEST_TIMEOUT)
+
+    # Rate limited: wait as long as Bittrex asks (capped) and retry once
+    if response.status_code == 429:
+        retry_after = response.headers.get('Retry-After')
+        sleep(min(60.0, float(retry_after)) if retry_after and retry_after.isdigit() else backoff(0))
+
+        response = session.get(request_url, headers={"apisign": apisign}, timeout=REQUEST_TIMEOUT)
+
+    return json_loads(response.content)
 
 
 def return_request_input(request_url, apisign):
@@ -53,6 +103,30 @@ def return_request_input(request_url, apisign):
     }
 
 
+def fast_urlencode(options):
+    """
+    Encode options into a query string. Same output as urllib.parse.urlencode, but keys and values
+    that need no escaping (market names, uuids, rates) are copied as-is instead of passed to quote_plus.
+    :param options: (dict) Query parameters
+    :return: (str)
+    """
+    parameters = []
+
+    for key, value in options.items():
+        key = str(key)
+        value = str(value)
+
+        if not URL_SAFE_CHARACTERS.issuperset(key):
+            key = quote_plus(key)
+
+        if not URL_SAFE_CHARACTERS.issuperset(value):
+            value = quote_plus(value)
+
+        parameters.append(key + '=' + value)
+
+    return '&'.join(parameters)
+
+
 def filter_bittrex_markets(markets, base_coin):
     """
     Filter all Bittrex markets using a base currency.
@@ -60,33 +134,132 @@ def filter_bittrex_markets(markets, base_coin):
     :param base_coin: Base currency
     :return: (list)
     """
-    return [x.get('MarketName') for x in markets
+    return [x['MarketName'] for x in markets
             if x.get('BaseCurrency') == base_coin and x.get('IsActive')]
 
 
-def format_bittrex_entry(data,
-                         fields=('time', 'price', 'wprice', 'base_volume', 'buy_volume', 'sell_volume', 'buy_order', 'sell_order')):
-    """
-    Format data object (summary per interval) into SQL row format.
-    :param data: Summary of market per interval
-    :param fields: Keys to add in data
-    :return: (list) tuples
-    """
-
-    return fields, tuple(data.get(x) for x in fields)
-
-
 class Bittrex(object):
     """
     Used for requesting Bittrex with API key and API secret
     """
 
-    def __init__(self, api_key, api_secret, dispatch=using_requests, api_version=API_V1_1):
+    # Endpoint paths per API version
+    _GET_MARKETS_PATHS = {
+        API_V1_1: '/public/getmarkets',
+        API_V2_0: '/pub/Markets/GetMarkets'
+    }
+    _GET_CURRENCIES_PATHS = {
+        API_V1_1: '/public/getcurrencies',
+        API_V2_0: '/pub/Currencies/GetCurrencies'
+    }
+    _GET_TICKER_PATHS = {API_V1_1: '/public/getticker'}
+    _GET_MARKET_SUMMARIES_PATHS = {
+        API_V1_1: '/public/getmarketsummaries',
+        API_V2_0: '/pub/Markets/GetMarketSummaries'
+    }
+    _GET_MARKETSUMMARY_PATHS = {
+        API_V1_1: '/public/getmarketsummary',
+        API_V2_0: '/pub/Market/GetMarketSummary'
+    }
+    _GET_ORDERBOOK_PATHS = {
+        API_V1_1: '/public/getorderbook',
+        API_V2_0: '/pub/Market/GetMarketOrderBook'
+    }
+    _GET_MARKET_HISTORY_PATHS = {
+        API_V1_1: '/public/getmarkethistory',
+        API_V2_0: '/pub/Market/GetMarketHistory'
+    }
+    _BUY_LIMIT_PATHS = {API_V1_1: '/market/buylimit'}
+    _SELL_LIMIT_PATHS = {API_V1_1: '/market/selllimit'}
+    _CANCEL_PATHS = {
+        API_V1_1: '/market/cancel',
+        API_V2_0: '/key/market/tradecancel'
+    }
+    _GET_OPEN_ORDERS_PATHS = {
+        API_V1_1: '/market/getopenorders',
+        API_V2_0: '/key/market/getopenorders'
+    }
+    _GET_BALANCES_PATHS = {
+        API_V1_1: '/account/getbalances',
+        API_V2_0: '/key/balance/getbalances'
+    }
+    _GET_BALANCE_PATHS = {
+        API_V1_1: '/account/getbalance',
+        API_V2_0: '/key/balance/getbalance'
+    }
+    _GET_DEPOSIT_ADDRESS_PATHS = {
+        API_V1_1: '/account/getdepositaddress',
+        API_V2_0: '/key/balance/getdepositaddress'
+    }
+    _WITHDRAW_PATHS = {
+        API_V1_1: '/account/withdraw',
+        API_V2_0: '/key/balance/withdrawcurrency'
+    }
+    _GET_ORDER_HISTORY_PATHS = {
+        API_V1_1: '/account/getorderhistory',
+        API_V2_0: '/key/orders/getorderhistory'
+    }
+    _GET_ORDER_PATHS = {
+        API_V1_1: '/account/getorder',
+        API_V2_0: '/key/orders/getorder'
+    }
+    _GET_WITHDRAWAL_HISTORY_PATHS = {
+        API_V1_1: '/account/getwithdrawalhistory',
+        API_V2_0: '/key/balance/getwithdrawalhistory'
+    }
+    _GET_DEPOSIT_HISTORY_PATHS = {
+        API_V1_1: '/account/getdeposithistory',
+        API_V2_0: '/key/balance/getdeposithistory'
+    }
+    _GET_WALLET_HEALTH_PATHS = {API_V2_0: '/pub/Currencies/GetWalletHealth'}
+    _GET_BALANCE_DISTRIBUTION_PATHS = {API_V2_0: '/pub/Currency/GetBalanceDistribution'}
+    _GET_PENDING_WITHDRAWALS_PATHS = {API_V2_0: '/key/balance/getpendingwithdrawals'}
+    _GET_PENDING_DEPOSITS_PATHS = {API_V2_0: '/key/balance/getpendingdeposits'}
+    _GENERATE_DEPOSIT_ADDRESS_PATHS = {API_V2_0: '/key/balance/getpendingdeposits'}
+    _TRADE_SELL_PATHS = {API_V2_0: '/key/market/tradesell'}
+    _TRADE_BUY_PATHS = {API_V2_0: '/key/market/tradebuy'}
+    _GET_CANDLES_PATHS = {API_V2_0: '/pub/market/GetTicks'}
+    _GET_LATEST_CANDLE_PATHS = {API_V2_0: '/pub/market/GetLatestTick'}
+
+    def __init__(self, api_key, api_secret, dispatch=using_requests, api_version=API_V1_1, digest_name='sha512'):
         self.api_key = str(api_key) if api_key is not None else ''
         self.api_secret = str(api_secret) if api_secret is not None else ''
-        self.dispatch = dispatch
+        self._secret_bytes = self.api_secret.encode()
         self.api_version = api_version
 
+        # Each client keeps its own connection pool, closed with close()
+        self.session = create_session()
+        self.dispatch = partial(using_requests, session=self.session) if dispatch is using_requests else dispatch
+
+        # Bittrex requires HMAC-SHA512; forks signing for other exchanges can pass e.g. 'sha256'
+        self._digest = digest_name
+
+        self._base_url = BASE_URL_V2_0 if api_version == API_V2_0 else BASE_URL_V1_1
+        self._url_cache = {}
+
+        # (kept, dropped) option names when a method passes both versions of a parameter
+        self._option_aliases = tuple((v2, v1) if api_version == API_V2_0 else (v1, v2) for v1, v2 in OPTION_ALIASES)
+
+        # Last nonce sent by this client
+        self._last_nonce = 0
+
+    def close(self):
+        """
+        Close the client's HTTP connections
+        :return:
+        """
+        self.session.close()
+
+    def _next_nonce(self):
+        """
+        Millisecond clock nonce that still increases if two calls land in the same millisecond.
+        :return: (int)
+        """
+
+        self._last_nonce = max(self._last_nonce + 1, int(time() * 1000))
+
+        return self._last_nonce
+
     def _api_query(self, protection=None, path_dict=None, options=None):
         """
         Queries Bittrex
@@ -96,30 +269,34 @@ class Bittrex(object):
         :rtype : dict
         """
 
-        if not options:
-            options = {}
+        path = path_dict.get(self.api_version)
 
-        if self.api_version not in path_dict:
-            raise Exception('method call not available under API version {}'.format(self.api_version))
+        if path is None:
+            raise Exception(f'method call not available under API version {self.api_version}')
 
-        request_url = BASE_URL_V2_0 if self.api_version == API_V2_0 else BASE_URL_V1_1
-        request_url = request_url.format(path=path_dict[self.api_version])
+        request_url = self._url_cache.get(path)
 
-        nonce = str(int(time() * 1000))
+        if request_url is None:
+            request_url = self._url_cache[path] = self._base_url.format(path=path)
 
         if protection != PROTECTION_PUB:
-            request_url = "{0}apikey={1}&nonce={2}&".format(request_url, self.api_key, nonce)
+            request_url = f"{request_url}apikey={self.api_key}&nonce={self._next_nonce()}&"
 
-        request_url += urlencode(options)
+        if options:
+            # Only send the parameter name this API version reads
+            for kept, dropped in self._option_aliases:
+                if kept in options and dropped in options:
+                    del options[dropped]
 
-        try:
-            apisign = hmac_new(self.api_secret.encode(),
-                               request_url.encode(),
-                               sha512).hexdigest()
+            request_url += fast_urlencode(options)
 
+        apisign = hmac_digest(self._secret_bytes, request_url.encode(), self._digest).hex()
+
+        try:
             return self.dispatch(request_url, apisign)
 
-        except:
+        # ValueError: response body is not valid JSON
+        except (RequestException, ValueError):
             return {
                 'success': False,
                 'message': 'NO_API_RESPONSE',
@@ -152,10 +329,7 @@ class Bittrex(object):
         :return: Available market info in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/public/getmarkets',
-            API_V2_0: '/pub/Markets/GetMarkets'
-        }, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_MARKETS_PATHS, protection=PROTECTION_PUB)
 
     def get_currencies(self):
         """
@@ -167,10 +341,7 @@ class Bittrex(object):
         :return: Supported currencies info in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/public/getcurrencies',
-            API_V2_0: '/pub/Currencies/GetCurrencies'
-        }, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_CURRENCIES_PATHS, protection=PROTECTION_PUB)
 
     def get_ticker(self, market):
         """
@@ -183,9 +354,7 @@ class Bittrex(object):
         :return: Current values for given market in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/public/getticker',
-        }, options={'market': market}, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_TICKER_PATHS, options={'market': market}, protection=PROTECTION_PUB)
 
     def get_market_summaries(self):
         """
@@ -196,10 +365,7 @@ class Bittrex(object):
         :return: Summaries of active exchanges in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/public/getmarketsummaries',
-            API_V2_0: '/pub/Markets/GetMarketSummaries'
-        }, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_MARKET_SUMMARIES_PATHS, protection=PROTECTION_PUB)
 
     def get_marketsummary(self, market):
         """
@@ -213,10 +379,9 @@ class Bittrex(object):
         :return: Summaries of active exchanges of a coin in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/public/getmarketsummary',
-            API_V2_0: '/pub/Market/GetMarketSummary'
-        }, options={'market': market, 'marketname': market}, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_MARKETSUMMARY_PATHS,
+                               options={'market': market, 'marketname': market},
+                               protection=PROTECTION_PUB)
 
     def get_orderbook(self, market, depth_type=BOTH_ORDERBOOK):
         """
@@ -234,10 +399,9 @@ class Bittrex(object):
         :return: Orderbook of market in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/public/getorderbook',
-            API_V2_0: '/pub/Market/GetMarketOrderBook'
-        }, options={'market': market, 'marketname': market, 'type': depth_type}, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_ORDERBOOK_PATHS,
+                               options={'market': market, 'marketname': market, 'type': depth_type},
+                               protection=PROTECTION_PUB)
 
     def get_market_history(self, market):
         """
@@ -264,10 +428,9 @@ class Bittrex(object):
         :return: Market history in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/public/getmarkethistory',
-            API_V2_0: '/pub/Market/GetMarketHistory'
-        }, options={'market': market, 'marketname': market}, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_MARKET_HISTORY_PATHS,
+                               options={'market': market, 'marketname': market},
+                               protection=PROTECTION_PUB)
 
     def buy_limit(self, market, quantity, rate):
         """
@@ -287,11 +450,9 @@ class Bittrex(object):
         :return:
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/market/buylimit',
-        }, options={'market': market,
-                    'quantity': quantity,
-                    'rate': rate}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._BUY_LIMIT_PATHS,
+                               options={'market': market, 'quantity': quantity, 'rate': rate},
+                               protection=PROTECTION_PRV)
 
     def sell_limit(self, market, quantity, rate):
         """
@@ -311,11 +472,9 @@ class Bittrex(object):
         :return:
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/market/selllimit',
-        }, options={'market': market,
-                    'quantity': quantity,
-                    'rate': rate}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._SELL_LIMIT_PATHS,
+                               options={'market': market, 'quantity': quantity, 'rate': rate},
+                               protection=PROTECTION_PRV)
 
     def cancel(self, uuid):
         """
@@ -328,10 +487,9 @@ class Bittrex(object):
         :return:
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/market/cancel',
-            API_V2_0: '/key/market/tradecancel'
-        }, options={'uuid': uuid, 'orderid': uuid}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._CANCEL_PATHS,
+                               options={'uuid': uuid, 'orderid': uuid},
+                               protection=PROTECTION_PRV)
 
     def get_open_orders(self, market=None):
         """
@@ -345,10 +503,9 @@ class Bittrex(object):
         :return: Open orders info in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/market/getopenorders',
-            API_V2_0: '/key/market/getopenorders'
-        }, options={'market': market, 'marketname': market} if market else None, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_OPEN_ORDERS_PATHS,
+                               options={'market': market, 'marketname': market} if market else None,
+                               protection=PROTECTION_PRV)
 
     def get_balances(self):
         """
@@ -370,10 +527,7 @@ class Bittrex(object):
         :return: Balances info in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/account/getbalances',
-            API_V2_0: '/key/balance/getbalances'
-        }, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_BALANCES_PATHS, protection=PROTECTION_PRV)
 
     def get_balance(self, currency):
         """
@@ -395,10 +549,9 @@ class Bittrex(object):
         :return: Balance info in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/account/getbalance',
-            API_V2_0: '/key/balance/getbalance'
-        }, options={'currency': currency, 'currencyname': currency}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_BALANCE_PATHS,
+                               options={'currency': currency, 'currencyname': currency},
+                               protection=PROTECTION_PRV)
 
     def get_deposit_address(self, currency):
         """
@@ -411,10 +564,9 @@ class Bittrex(object):
         :return: Address info in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/account/getdepositaddress',
-            API_V2_0: '/key/balance/getdepositaddress'
-        }, options={'currency': currency, 'currencyname': currency}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_DEPOSIT_ADDRESS_PATHS,
+                               options={'currency': currency, 'currencyname': currency},
+                               protection=PROTECTION_PRV)
 
     def withdraw(self, currency, quantity, address):
         """
@@ -431,10 +583,9 @@ class Bittrex(object):
         :return:
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/account/withdraw',
-            API_V2_0: '/key/balance/withdrawcurrency'
-        }, options={'currency': currency, 'quantity': quantity, 'address': address}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._WITHDRAW_PATHS,
+                               options={'currency': currency, 'quantity': quantity, 'address': address},
+                               protection=PROTECTION_PRV)
 
     def get_order_history(self, market=None):
         """
@@ -448,10 +599,9 @@ class Bittrex(object):
         :return: order history in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/account/getorderhistory',
-            API_V2_0: '/key/orders/getorderhistory'
-        }, options={'market': market, 'marketname': market} if market else None, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_ORDER_HISTORY_PATHS,
+                               options={'market': market, 'marketname': market} if market else None,
+                               protection=PROTECTION_PRV)
 
     def get_order(self, uuid):
         """
@@ -464,10 +614,9 @@ class Bittrex(object):
         :return:
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/account/getorder',
-            API_V2_0: '/key/orders/getorder'
-        }, options={'uuid': uuid, 'orderid': uuid}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_ORDER_PATHS,
+                               options={'uuid': uuid, 'orderid': uuid},
+                               protection=PROTECTION_PRV)
 
     def get_withdrawal_history(self, currency=None):
         """
@@ -481,11 +630,9 @@ class Bittrex(object):
         :rtype : dict
         """
 
-        return self._api_query(path_dict={
-            API_V1_1: '/account/getwithdrawalhistory',
-            API_V2_0: '/key/balance/getwithdrawalhistory'
-        }, options={'currency': currency, 'currencyname': currency} if currency else None,
-            protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_WITHDRAWAL_HISTORY_PATHS,
+                               options={'currency': currency, 'currencyname': currency} if currency else None,
+                               protection=PROTECTION_PRV)
 
     def get_deposit_history(self, currency=None):
         """
@@ -498,11 +645,9 @@ class Bittrex(object):
         :return: deposit history in JSON
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V1_1: '/account/getdeposithistory',
-            API_V2_0: '/key/balance/getdeposithistory'
-        }, options={'currency': currency, 'currencyname': currency} if currency else None,
-            protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_DEPOSIT_HISTORY_PATHS,
+                               options={'currency': currency, 'currencyname': currency} if currency else None,
+                               protection=PROTECTION_PRV)
 
     def list_markets_by_currency(self, currency):
         """
@@ -516,8 +661,10 @@ class Bittrex(object):
         :return: List of markets that the currency appears in
         :rtype: list
         """
+        suffix = '-' + currency.upper()
+
         return [market['MarketName'] for market in self.get_markets()['result']
-                if market['MarketName'].lower().endswith(currency.lower())]
+                if market['MarketName'].endswith(suffix)]
 
     def get_wallet_health(self):
         """
@@ -527,9 +674,7 @@ class Bittrex(object):
         2.0 /pub/Currencies/GetWalletHealth
         :return:
         """
-        return self._api_query(path_dict={
-            API_V2_0: '/pub/Currencies/GetWalletHealth'
-        }, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_WALLET_HEALTH_PATHS, protection=PROTECTION_PUB)
 
     def get_balance_distribution(self):
         """
@@ -539,9 +684,7 @@ class Bittrex(object):
         2.0 /pub/Currency/GetBalanceDistribution
         :return:
         """
-        return self._api_query(path_dict={
-            API_V2_0: '/pub/Currency/GetBalanceDistribution'
-        }, protection=PROTECTION_PUB)
+        return self._api_query(path_dict=self._GET_BALANCE_DISTRIBUTION_PATHS, protection=PROTECTION_PUB)
 
     def get_pending_withdrawals(self, currency=None):
         """
@@ -554,10 +697,9 @@ class Bittrex(object):
         :return: pending widthdrawls in JSON
         :rtype : list
         """
-        return self._api_query(path_dict={
-            API_V2_0: '/key/balance/getpendingwithdrawals'
-        }, options={'currencyname': currency} if currency else None,
-            protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_PENDING_WITHDRAWALS_PATHS,
+                               options={'currencyname': currency} if currency else None,
+                               protection=PROTECTION_PRV)
 
     def get_pending_deposits(self, currency=None):
         """
@@ -570,10 +712,9 @@ class Bittrex(object):
         :return: pending deposits in JSON
         :rtype : list
         """
-        return self._api_query(path_dict={
-            API_V2_0: '/key/balance/getpendingdeposits'
-        }, options={'currencyname': currency} if currency else None,
-            protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GET_PENDING_DEPOSITS_PATHS,
+                               options={'currencyname': currency} if currency else None,
+                               protection=PROTECTION_PRV)
 
     def generate_deposit_address(self, currency):
         """
@@ -586,9 +727,9 @@ class Bittrex(object):
         :return: result of creation operation
         :rtype : dict
         """
-        return self._api_query(path_dict={
-            API_V2_0: '/key/balance/getpendingdeposits'
-        }, options={'currencyname': currency}, protection=PROTECTION_PRV)
+        return self._api_query(path_dict=self._GENERATE_DEPOSIT_ADDRESS_PATHS,
+                               options={'currencyname': currency},
+                               protection=PROTECTION_PRV)
 
     def trade_sell(self, market=None, order_type=None, quantity=None, rate=None, time_in_effect=None,
                    condition_type=None, target=0.0):
@@ -617,9 +758,7 @@ class Bittrex(object):
         :type target: float
         :return:
         """
-        return self._api_query(path_dict={
-            API_V2_0: '/key/market/tradesell'
-        }, options={
+        return self._api_query(path_dict=self._TRADE_SELL_PATHS, options={
             'marketname': market,
             'ordertype': order_type,
             'quantity': quantity,
@@ -656,9 +795,7 @@ class Bittrex(object):
         :type target: float
         :return:
         """
-        return self._api_query(path_dict={
-            API_V2_0: '/key/market/tradebuy'
-        }, options={
+        return self._api_query(path_dict=self._TRADE_BUY_PATHS, options={
             'marketname': market,
             'ordertype': order_type,
             'quantity': quantity,
@@ -697,9 +834,7 @@ class Bittrex(object):
         :rtype: dict
         """
 
-        return self._api_query(path_dict={
-            API_V2_0: '/pub/market/GetTicks'
-        }, options={
+        return self._api_query(path_dict=self._GET_CANDLES_PATHS, options={
             'marketName': market, 'tickInterval': tick_interval
         }, protection=PROTECTION_PUB)
 
@@ -725,9 +860,7 @@ class Bittrex(object):
         :rtype: dict
         """
 
-        return self._api_query(path_dict={
-            API_V2_0: '/pub/market/GetLatestTick'
-        }, options={
+        return self._api_query(path_dict=self._GET_LATEST_CANDLE_PATHS, options={
             'marketName': market, 'tickInterval': tick_interval
         }, protection=PROTECTION_PUB)
 
@@ -749,6 +882,30 @@ class Bittrex(object):
 
         return ticker_result
 
+    def wait_for_order(self, uuid, delays=ORDER_SETTLE_DELAYS):
+        """
+        Wait for an order to close, checking after each delay so a quick fill returns early
+        :param uuid: uuid of buy or sell order
+        :param delays: Seconds to wait before each check
+        :return: Last successful get_order response, or None if every check failed
+        """
+
+        settled_response = None
+
+        for delay in delays:
+            # Jitter keeps multiple market threads from polling in lockstep
+            sleep(delay + random() * 0.1)
+
+            order_response = self.get_order(uuid)
+
+            if order_response.get('success'):
+                settled_response = order_response
+
+                if not order_response.get('result').get('IsOpen'):
+                    break
+
+        return settled_response
+
     def sell_or_else(self, market, quantity, rate, retry=3, logger=None):
         """
         Wrapper function foy buy_limit
@@ -773,10 +930,13 @@ class Bittrex(object):
 
                 sell_uuid = sell_response.get('result').get('uuid')
 
-                sleep(3)  # Wait for sell order to complete before getting order information
+                # Wait for sell order to complete before getting order information
+                settled_response = self.wait_for_order(sell_uuid)
 
                 for jj in range(retry):
-                    order_response = self.get_order(sell_uuid)
+                    # Reuse the last status check from the wait before calling the API again
+                    order_response = settled_response or self.get_order(sell_uuid)
+                    settled_response = None
 
                     if order_response.get('success'):
 
@@ -794,7 +954,7 @@ class Bittrex(object):
                                         'Max API retry limit ({}) reached. TAKE MANUAL ACTION. CONTINUING ...'.format(market, str(retry)))
                         raise RuntimeError('Error: Get sell order metadata max API retry limit reached.')
 
-                    sleep(1)
+                    sleep(backoff(jj))
 
                 break
 
@@ -804,7 +964,7 @@ class Bittrex(object):
                                 'Max API retry limit ({}) reached. TAKE MANUAL ACTION. CONTINUING ...'.format(market, str(retry)))
                 raise RuntimeError('Error: Sell order max API retry limit reached.')
 
-            sleep(1)
+            sleep(backoff(ii))
 
         return response
 
@@ -831,22 +991,27 @@ class Bittrex(object):
                     logger.info('Tradebot: {}: buy order: SUCCESS.'.format(market))
                 buy_uuid = buy_response.get('result').get('uuid')
 
-                sleep(3)  # Wait for buy order to complete before getting order information
+                # Wait for buy order to complete before getting order information
+                settled_response = self.wait_for_order(buy_uuid)
 
                 for jj in range(retry):
-                    order_response = self.get_order(buy_uuid)
+                    # Reuse the last status check from the wait before calling the API again
+                    order_response = settled_response or self.get_order(buy_uuid)
+                    settled_response = None
 
                     if order_response.get('success'):
                         if logger:
                             logger.info('Tradebot: {}: get buy order metadata: SUCCESS.'.format(market))
+                        result = order_response['result']
+
                         response['success'] = True
-                        response['result'] = order_response.get('result')
+                        response['result'] = result
 
-                        quantity = response.get('result').get('Quantity')
-                        remaining = response.get('result').get('QuantityRemaining')
+                        remaining = result['QuantityRemaining']
 
                         if remaining > 0:
 
+                            quantity = result['Quantity']
                             response['success'] = False
 
                             if logger:
@@ -869,7 +1034,7 @@ class Bittrex(object):
                                     if kk == retry - 1:
                                         raise RuntimeError('Tradebot: failed to cancel remaining order.')
 
-                                sleep(1)
+                                sleep(backoff(kk))
                         break
 
                     if jj == retry - 1:
@@ -878,7 +1043,7 @@ class Bittrex(object):
                                         'Max API retry limit ({}) reached: {}. CONTINUING ...'.format(market, str(retry), order_response.get('message')))
                         raise RuntimeError('Tradebot: failed to get buy order metadata.')
 
-                    sleep(1)
+                    sleep(backoff(jj))
 
                 break
 
@@ -886,6 +1051,8 @@ class Bittrex(object):
                 if logger:
                     logger.info('Tradebot: {}: buy order: FAILED. '
                                 'Max API retry limit ({}) reached. CONTINUING ...'.format(market, str(retry)))
-            sleep(1)
+                break
+
+            sleep(backoff(ii))
 
         return response
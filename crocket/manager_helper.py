@@ -1,6 +1,23 @@
 from decimal import Decimal
+from functools import lru_cache
 
 from utilities.constants import BittrexConstants, OrderStatus
+from utilities.TickerCache import TickerCache
+
+# Tickers shared by buy and sell orders placed within the same few seconds
+TICKER_CACHE = TickerCache(ttl=2)
+
+
+@lru_cache(maxsize=None)
+def percent_to_decimal(percent):
+    """
+    Convert a percent to an exact Decimal fraction (Ex: 5 -> Decimal('0.05')).
+    Callers use a handful of fixed percents, so each is only converted once.
+    :param percent: Number between 0 and 100 (or above)
+    :return: (Decimal)
+    """
+
+    return Decimal(str(percent)) / 100
 
 
 def skip_order(order, order_list, out_queue, logger):
@@ -13,7 +30,7 @@ def skip_order(order, order_list, out_queue, logger):
     :return:
     """
 
-    order.status = OrderStatus.SKIPPED.name
+    order.status = OrderStatus.SKIPPED
     order_list.remove(order)
     out_queue.put(order)
 
@@ -58,7 +75,7 @@ def buy_above_bid(order, wallet, bittrex, logger,
     """
 
     try:
-        ticker = bittrex.get_ticker_or_else(order.market)
+        ticker = TICKER_CACHE.get(order.market, bittrex.get_ticker_or_else)
 
     except (ConnectionError, ValueError) as e:
 
@@ -71,7 +88,7 @@ def buy_above_bid(order, wallet, bittrex, logger,
     bid_price = Decimal(str(ticker.get('Bid')))
     ask_price = Decimal(str(ticker.get('Ask')))
 
-    price_buffer = ((ask_price - bid_price) * Decimal(str(percent / 100)))
+    price_buffer = ((ask_price - bid_price) * percent_to_decimal(percent))
 
     buy_price = (bid_price + price_buffer).quantize(BittrexConstants.DIGITS)
 
@@ -93,7 +110,7 @@ def buy_above_bid(order, wallet, bittrex, logger,
 
         if buy_response.get('success'):
             order.uuid = buy_response.get('result').get('uuid')
-            order.status = OrderStatus.EXECUTED.name
+            order.status = OrderStatus.EXECUTED
             logger.info('Manager: Buy order for {} submitted successfully.'.format(order.market))
         else:
             logger.info('Manager: Failed to buy {}: {}.'.format(order.market, buy_response.get('message')))
@@ -125,7 +142,7 @@ def sell_below_ask(order, wallet, bittrex, logger,
     """
 
     try:
-        ticker = bittrex.get_ticker_or_else(order.market)
+        ticker = TICKER_CACHE.get(order.market, bittrex.get_ticker_or_else)
 
     except (ConnectionError, ValueError) as e:
 
@@ -138,7 +155,7 @@ def sell_below_ask(order, wallet, bittrex, logger,
     bid_price = Decimal(str(ticker.get('Bid')))
     ask_price = Decimal(str(ticker.get('Ask')))
 
-    price_buffer = ((ask_price - bid_price) * Decimal(str(percent / 100)))
+    price_buffer = ((ask_price - bid_price) * percent_to_decimal(percent))
 
     sell_price = (ask_price - price_buffer).quantize(BittrexConstants.DIGITS)
 
@@ -160,7 +177,7 @@ def sell_below_ask(order, wallet, bittrex, logger,
 
         if sell_response.get('success'):
             order.uuid = sell_response.get('result').get('uuid')
-            order.status = OrderStatus.EXECUTED.name
+            order.status = OrderStatus.EXECUTED
             logger.info('Manager: Sell order for {} submitted successfully.'.format(order.market))
         else:
             logger.info('Manager: Failed to sell {}: {}.'.format(order.market, sell_response.get('message')))
@@ -1,7 +1,7 @@
+from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
 from flask import Flask, jsonify, request
-from itertools import chain
 from json import load as json_load
 from requests.exceptions import ConnectionError
 from requests_futures.sessions import FuturesSession
@@ -13,7 +13,7 @@ from random import shuffle
 from time import sleep, time
 from traceback import format_exc
 
-from bittrex.bittrex2 import Bittrex, format_bittrex_entry, return_request_input
+from bittrex.bittrex2 import ENTRY_FIELDS, ENTRY_GETTER, Bittrex, return_request_input
 from bittrex.BittrexOrder import BittrexOrder
 from bittrex.BittrexStatus import BittrexStatus
 from bittrex.BittrexData import BittrexData
@@ -23,6 +23,7 @@ from sql.sql import Database
 from trade_algorithm import run_algorithm
 from utilities.constants import BittrexConstants, OrderStatus, OrderType
 from utilities.credentials import get_credentials
+from utilities.network import backoff
 from utilities.time import convert_bittrex_timestamp_to_datetime, format_time, utc_to_local
 from utilities.Wallet import Wallet
 
@@ -67,6 +68,17 @@ USERNAME, PASSCODE = get_credentials(CREDENTIALS_FILE_PATH)
 
 TRADEBOT_DATABASE = 'TRADEBOT_RECORD'
 
+# Columns of the trade table, in the order format_tradebot_entry returns them
+TRADE_FIELDS = ('market', 'buy_time', 'buy_signal', 'buy_price', 'buy_total', 'sell_time', 'sell_signal', 'sell_price',
+                'sell_total', 'profit', 'percent')
+
+# Scraper rows are buffered and written in batches: flush after this many polls with entries or seconds
+FLUSH_ENTRY_COUNT = 10
+FLUSH_INTERVAL = 300
+
+# Rows kept per market while inserts keep failing (one day of 60 s intervals); the oldest are dropped past this
+MAX_PENDING_ROWS = 1440
+
 app = Flask(__name__)
 
 # ==============================================================================
@@ -181,20 +193,36 @@ def format_tradebot_entry(market, buy_time, buy_signal, buy_price, buy_total, se
     :param sell_total: Net total of sell order
     :param profit: Net profit (sell total - buy total)
     :param percent: Net percent ((sell total - buy total) / buy total)
-    :return:
+    :return: (tuple) Values in TRADE_FIELDS order
+    """
+
+    return (market, buy_time, buy_signal, buy_price, buy_total, sell_time, sell_signal, sell_price, sell_total,
+            profit, percent)
+
+
+def flush_entries(db, pending_entries, logger):
+    """
+    Write buffered scraper rows to their market tables with one batched insert per market.
+    Rows of a failed insert stay buffered for the next flush, up to MAX_PENDING_ROWS per market.
+    :param db: Database object
+    :param pending_entries: (dict) Market name to list of rows
+    :param logger: Main logger
+    :return: (bool) True if every market's rows were written
     """
 
-    return [('market', market),
-            ('buy_time', buy_time),
-            ('buy_signal', buy_signal),
-            ('buy_price', buy_price),
-            ('buy_total', buy_total),
-            ('sell_time', sell_time),
-            ('sell_signal', sell_signal),
-            ('sell_price', sell_price),
-            ('sell_total', sell_total),
-            ('profit', profit),
-            ('percent', percent)]
+    for market in list(pending_entries):
+        rows = pending_entries[market]
+
+        if not rows or db.insert_many_query(market, ENTRY_FIELDS, rows):
+            del pending_entries[market]
+            continue
+
+        if len(rows) > MAX_PENDING_ROWS:
+            logger.error('Scraper: Failed inserts for %s, dropping %d oldest unsaved rows.',
+                         market, len(rows) - MAX_PENDING_ROWS)
+            del rows[:-MAX_PENDING_ROWS]
+
+    return not pending_entries
 
 
 def shutdown_server():
@@ -244,10 +272,15 @@ def run_scraper(control_queue, database_name, logger, markets=MARKETS,
     # Initialize variables
     run_tradebot = False
     proxy_indexes = list(range(len(PROXIES)))
+    failures = 0
 
     working_data = {}
+    pending_entries = defaultdict(list)
+    pending_count = 0
+    last_flush = time()
 
     current_datetime = datetime.now().astimezone(tz=None)
+    interval_origin = current_datetime.timestamp()
     current_datetime = {k: current_datetime for k in MARKETS}
     last_price = {k: Decimal(0).quantize(BittrexConstants.DIGITS) for k in MARKETS}
     weighted_price = {k: Decimal(0).quantize(BittrexConstants.DIGITS) for k in MARKETS}
@@ -263,6 +296,9 @@ def run_scraper(control_queue, database_name, logger, markets=MARKETS,
                 response_dict = get_data(MARKETS, bittrex_request, session, PROXIES, proxy_indexes,
                                          logger=logger)
 
+                # Back off while every market history call fails (Bittrex outage or rate limit)
+                failures = 0 if response_dict else failures + 1
+
                 working_data, current_datetime, last_price, weighted_price, entries = \
                     process_data(response_dict, working_data, current_datetime, last_price, weighted_price, logger,
                                  interval)
@@ -273,19 +309,34 @@ def run_scraper(control_queue, database_name, logger, markets=MARKETS,
                     SCRAPER_TRADEBOT_QUEUE.put(tradebot_entries)
 
                 if entries:
-                    formatted_entries = list(chain.from_iterable(
-                        [[(x, *format_bittrex_entry(y)) for y in entries[x]] for x in entries]))
+                    for market in entries:
+                        pending_entries[market].extend(map(ENTRY_GETTER, entries[market]))
+
+                    pending_count += 1
 
-                    db.insert_transaction_query(formatted_entries)
+                if pending_count >= FLUSH_ENTRY_COUNT or (pending_count and start - last_flush >= FLUSH_INTERVAL):
+                    # On failure the counter is kept so the next poll tries again
+                    if flush_entries(db, pending_entries, logger):
+                        pending_count = 0
+                        last_flush = start
 
                 stop = time()
                 run_time = stop - start
 
                 if run_time > 5:
-                    logger.info('Scraper: Total time: {0:.2f}s'.format(run_time))
+                    logger.info('Scraper: Total time: %.2fs', run_time)
 
-                if run_time < sleep_time:
-                    sleep(sleep_time - run_time)
+                if failures:
+                    # Grow from the normal wait, never below it, and never past one interval
+                    wait_time = sleep_time + backoff(failures - 1, base=sleep_time, cap=interval) - run_time
+                else:
+                    # Every market steps from the same start time, so they share interval boundaries.
+                    # Shorten the wait near a boundary so the next poll lands just after it.
+                    time_to_boundary = interval - (stop - interval_origin) % interval
+                    wait_time = min(sleep_time - run_time, max(1, time_to_boundary + 1))
+
+                if wait_time > 0:
+                    sleep(wait_time)
 
                 if not control_queue.empty():
 
@@ -306,7 +357,10 @@ def run_scraper(control_queue, database_name, logger, markets=MARKETS,
     except ConnectionError as e:
         logger.debug('ConnectionError: {}. Exiting ...'.format(e))
     finally:
+        flush_entries(db, pending_entries, logger)
+
         db.close()
+        bittrex_request.close()
 
         logger.info("Scraper: Stopped scraper.")
         logger.info("Scraper: Database connection closed.")
@@ -377,7 +431,7 @@ def run_tradebot(control_queue, data_queue, pending_order_queue, completed_order
                     if completed_order.type == OrderType.BUY.name:
 
                         # Check if buy order skipped
-                        if completed_order.status == OrderStatus.SKIPPED.name:
+                        if completed_order.status == OrderStatus.SKIPPED:
                             market_status[order_market].bought = False
                             market_status[order_market].buy_signal = None
                             logger.info('Tradebot: Received skipped buy order. Skipping buy order for {}.'.format(
@@ -392,8 +446,8 @@ def run_tradebot(control_queue, data_queue, pending_order_queue, completed_order
                         status = market_status[order_market]
 
                         # Completed buy and sell order for single market
-                        if status.buy_order.status == OrderStatus.COMPLETED.name and \
-                                status.sell_order.status == OrderStatus.COMPLETED.name:
+                        if status.buy_order.status == OrderStatus.COMPLETED and \
+                                status.sell_order.status == OrderStatus.COMPLETED:
                             profit = (status.sell_order.final_total + status.buy_order.final_total).quantize(
                                 BittrexConstants.DIGITS)
                             percent = (profit * Decimal(-100) / status.buy_order.final_total).quantize(
@@ -404,17 +458,18 @@ def run_tradebot(control_queue, data_queue, pending_order_queue, completed_order
 
                             logger.info('Tradebot: completed buy/sell order for {}.'.format(order_market))
 
-                            db.insert_query(table_name, format_tradebot_entry(order_market,
-                                                                              formatted_buy_time,
-                                                                              status.buy_signal,
-                                                                              status.buy_order.actual_price,
-                                                                              status.buy_order.final_total,
-                                                                              formatted_sell_time,
-                                                                              status.sell_signal,
-                                                                              status.sell_order.actual_price,
-                                                                              status.sell_order.final_total,
-                                                                              profit,
-                                                                              percent))
+                            db.insert_values_query(table_name, TRADE_FIELDS,
+                                                   format_tradebot_entry(order_market,
+                                                                         formatted_buy_time,
+                                                                         status.buy_signal,
+                                                                         status.buy_order.actual_price,
+                                                                         status.buy_order.final_total,
+                                                                         formatted_sell_time,
+                                                                         status.sell_signal,
+                                                                         status.sell_order.actual_price,
+                                                                         status.sell_order.final_total,
+                                                                         profit,
+                                                                         percent))
 
                             # Reset buy/sell orders and buy/sell signals
                             status.clear_orders()
@@ -455,6 +510,7 @@ def run_tradebot(control_queue, data_queue, pending_order_queue, completed_order
         #logger.info('Tradebot: Stopping tradebot ...')
     finally:
         db.close()
+        bittrex.close()
         logger.info('Tradebot: Database connection closed.')
 
 
@@ -507,7 +563,7 @@ def run_manager(control_queue, order_queue, completed_queue, wallet_total, logge
                 if order.type == OrderType.BUY.name:
 
                     # Check status of buy order if executed
-                    if order.status == OrderStatus.EXECUTED.name:
+                    if order.status == OrderStatus.EXECUTED:
                         try:
                             order_response = bittrex.get_order(order.uuid)
 
@@ -595,7 +651,7 @@ def run_manager(control_queue, order_queue, completed_queue, wallet_total, logge
 
                 # Actions for sell order
                 else:
-                    if order.status == OrderStatus.EXECUTED.name:
+                    if order.status == OrderStatus.EXECUTED:
                         try:
                             order_response = bittrex.get_order(order.uuid)
 
@@ -723,7 +779,7 @@ def run_manager(control_queue, order_queue, completed_queue, wallet_total, logge
             # Cancel orders and execute market sells
             for order in active_orders:
 
-                if order.status == OrderStatus.EXECUTED.name:
+                if order.status == OrderStatus.EXECUTED:
 
                     cancel_response = bittrex.cancel(order.uuid)
 
@@ -767,6 +823,8 @@ def run_manager(control_queue, order_queue, completed_queue, wallet_total, logge
         else:
             logger.info('Manager: Successfully closed all positions.')
 
+        bittrex.close()
+
         logger.info('FINAL WALLET AMOUNT: {}'.format(str(wallet.get_quantity('BTC'))))
         logger.info('Manager: Stopped manager.')
 
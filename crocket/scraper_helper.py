@@ -2,23 +2,63 @@ from concurrent.futures import as_completed
 from copy import deepcopy
 from decimal import Decimal
 from datetime import timedelta
+from operator import itemgetter
+from numpy import dot, dtype, fromiter
 from requests.exceptions import ConnectTimeout, ConnectionError, ProxyError, ReadTimeout
 
+from utilities.constants import BittrexConstants
 from utilities.network import configure_ip, process_response
-from utilities.time import convert_bittrex_timestamp_to_datetime, format_time, utc_to_local
+from utilities.time import convert_bittrex_timestamp_to_local, format_time
 
+DECIMAL_PLACES = BittrexConstants.DIGITS
 
-def get_interval_index(timestamp_list, target_datetime, interval):
+# Parsed timestamp attached to each market history entry by parse_timestamps
+TIMESTAMP_GETTER = itemgetter('_ts')
+
+# Packed row of a market history entry for calculate_metrics
+METRICS_DTYPE = dtype([('price', 'f8'), ('total', 'f8'), ('buy', '?')])
+
+
+def bisect_timestamps(sequence, target, lo=0, key=None):
+    """
+    Binary search an oldest-first list of datetimes.
+    :param sequence: (list) Sorted oldest first
+    :param target: (datetime)
+    :param lo: (int) Index to start searching from
+    :param key: Function to get the datetime from an item (Ex: itemgetter('_ts'))
+    :return: (int) Index of the first item newer than target
+    """
+
+    hi = len(sequence)
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        value = sequence[mid] if key is None else key(sequence[mid])
+
+        if value > target:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    return lo
+
+
+def get_interval_index(timestamp_list, target_datetime, interval, key=None):
     """
     Get index of start and stop positions of interval from a list of data entries.
+
+    timestamp_list is ordered oldest first, so timestamp_list[start:stop] holds the entries after target_datetime up to
+    the end of the interval, and both positions are found by binary search.
     :param timestamp_list: list
     :param target_datetime: (datetime) Start of interval
     :param interval: (int) Seconds between data points
+    :param key: Function to get the datetime from an entry, if entries are not datetimes
     :return:
     """
 
-    stop_index = len([x for x in timestamp_list if x > target_datetime])
-    start_index = len([x for x in timestamp_list if (x - target_datetime).total_seconds() > interval])
+    start_index = bisect_timestamps(timestamp_list, target_datetime, key=key)
+    stop_index = bisect_timestamps(timestamp_list, target_datetime + timedelta(seconds=interval), lo=start_index,
+                                   key=key)
 
     return start_index, stop_index
 
@@ -31,7 +71,7 @@ def calculate_metrics(data, start_datetime, digits=8):
     :param digits: (int) Number of decimal places
     :return:
     """
-    decimal_places = Decimal(10) ** (digits * -1)
+    decimal_places = DECIMAL_PLACES if digits == 8 else Decimal(10) ** (digits * -1)
 
     volume = 0
     buy_volume = 0
@@ -44,24 +84,28 @@ def calculate_metrics(data, start_datetime, digits=8):
                                  "%Y-%m-%d %H:%M:%S")
 
     if data and isinstance(data[0], dict):
-        p, v, o = map(list, zip(*[(x.get('Price'), x.get('Total'), x.get('OrderType')) for x in data]))
+        orders = fromiter(((x.get('Price'), x.get('Total'), x.get('OrderType') == 'BUY') for x in data),
+                          dtype=METRICS_DTYPE,
+                          count=len(data))
+        p = orders['price']
+        v = orders['total']
+        is_buy = orders['buy']
 
-        volume = Decimal(sum(v)).quantize(decimal_places)
+        total = v.sum()
+        volume = Decimal(total).quantize(decimal_places)
 
         # Need this: volume can be 0
         # [{'Id': 20218449, 'TimeStamp': '2017-11-17T04:22:46.39',
         # 'Quantity': 1.5e-07, 'Price': 0.00021798, 'Total': 0.0,
         # 'FillType': 'PARTIAL_FILL', 'OrderType': 'BUY'}]
         if volume != 0:
-            buy_volume = Decimal(sum([x for x, y in zip(v, o) if y == 'BUY'])).quantize(decimal_places)
-            sell_volume = Decimal(sum([x for x, y in zip(v, o) if y == 'SELL'])).quantize(decimal_places)
-            buy_order = sum([1 for x in o if x == 'BUY'])
-            sell_order = len(o) - buy_order
+            buy_volume = Decimal(v[is_buy].sum()).quantize(decimal_places)
+            sell_volume = Decimal(v[~is_buy].sum()).quantize(decimal_places)
+            buy_order = int(is_buy.sum())
+            sell_order = len(data) - buy_order
 
-            price = (sum([Decimal(x).quantize(decimal_places) for x in p]) / Decimal(len(p))).quantize(decimal_places)
-            price_volume_weighted = (sum(
-                [Decimal(x).quantize(decimal_places) * Decimal(y) for x, y in zip(p, v)]) / Decimal(sum(v))).quantize(
-                decimal_places)
+            price = Decimal(p.mean()).quantize(decimal_places)
+            price_volume_weighted = Decimal(dot(p, v) / total).quantize(decimal_places)
 
     metrics = {'base_volume': volume,
                'buy_order': buy_order,
@@ -110,7 +154,7 @@ def get_data(markets, bittrex, session, proxies, proxy_indexes, logger=None):
             if not response_data.get('success'):
                 if response_data.get('message') == "INVALID_MARKET":
                     markets.remove(future.market)
-                    logger.debug('Removed {}: invalid market ...'.format(future.market))
+                    logger.debug('Removed %s: invalid market ...', future.market)
                 continue
 
             response_dict[future.market] = response_data.get('result')
@@ -126,6 +170,20 @@ def get_data(markets, bittrex, session, proxies, proxy_indexes, logger=None):
     return response_dict
 
 
+def parse_timestamps(entries):
+    """
+    Attach the parsed local datetime of each market history entry under '_ts'.
+    Entries stay in the working list across polls, so each TimeStamp is only parsed once.
+    :param entries: (list(dict)) Market history entries
+    :return: entries
+    """
+
+    for entry in entries:
+        entry['_ts'] = convert_bittrex_timestamp_to_local(entry['TimeStamp'])
+
+    return entries
+
+
 def process_data(input_data, working_data, market_datetime, last_price, weighted_price, logger, interval=60):
 
     entries = {}
@@ -133,13 +191,17 @@ def process_data(input_data, working_data, market_datetime, last_price, weighted
     if not working_data:
         working_data = deepcopy(input_data)
 
+        # Working lists are kept oldest first: new entries are appended and processed entries deleted from the front
+        for market, working_list in working_data.items():
+            working_data[market] = parse_timestamps((working_list or [])[::-1])
+
     for market in working_data:
 
         input_list = input_data.get(market)
         working_list = working_data.get(market)
 
         try:
-            last_id = working_list[0].get('Id')
+            last_id = working_list[-1].get('Id')
 
             if input_list[0].get('Id') < last_id:  # TODO: Why does this happen? current response has smaller ID than previous response
                 continue
@@ -150,31 +212,27 @@ def process_data(input_data, working_data, market_datetime, last_price, weighted
 
         current_datetime = market_datetime.get(market)
 
-        id_list = [x.get('Id') for x in input_list]
+        # Position of the newest known entry in the response; Ids are unique
+        overlap_index = next((index for index, x in enumerate(input_list) if x.get('Id') == last_id), None)
 
-        if last_id in id_list:
-            overlap_index = id_list.index(last_id)
-            working_list = input_list[:overlap_index] + working_list
+        if overlap_index is not None:
+            working_list.extend(reversed(parse_timestamps(input_list[:overlap_index])))
         else:
-            working_list = input_list + working_list
+            working_list.extend(reversed(parse_timestamps(input_list)))
             logger.debug('SKIPPED NUMBER OF ORDERS, HIGH ORDER VOLUME!!!!!!!!')
-            logger.debug('Latest ID in {} working list not found in input data. Adding all input data to working list.'.format(market))
+            logger.debug('Latest ID in %s working list not found in input data. Adding all input data to working list.',
+                         market)
 
-        working_data[market] = working_list
-
-        latest_datetime = utc_to_local(convert_bittrex_timestamp_to_datetime(working_list[0].get('TimeStamp')))
+        latest_datetime = working_list[-1]['_ts']
 
         if (latest_datetime - current_datetime).total_seconds() > interval:
 
             entries[market] = []
 
-            timestamp_list = [utc_to_local(convert_bittrex_timestamp_to_datetime(x.get('TimeStamp')))
-                              for x in working_list]
-
-            start, stop = get_interval_index(timestamp_list, current_datetime, interval)
+            start, stop = get_interval_index(working_list, current_datetime, interval, key=TIMESTAMP_GETTER)
 
             if start == stop:
-                while (current_datetime + timedelta(seconds=interval)) < timestamp_list[start - 1]:
+                while (current_datetime + timedelta(seconds=interval)) < working_list[stop]['_ts']:
                     metrics = calculate_metrics(working_list[start:stop], current_datetime)
 
                     metrics['price'] = last_price.get(market)
@@ -199,6 +257,7 @@ def process_data(input_data, working_data, market_datetime, last_price, weighted
                 if len(entries[market]) == 0:
                     print("0 ENTIRES!!!")
 
-            working_data[market] = working_list[:start]
+            # Keep only entries after the end of the processed interval(s)
+            del working_list[:stop]
 
     return working_data, market_datetime, last_price, weighted_price, entries
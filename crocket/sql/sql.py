@@ -1,9 +1,26 @@
 from contextlib import closing
+from functools import lru_cache
 from itertools import chain
 
 from MySQLdb import connect, OperationalError, ProgrammingError
 
 
+@lru_cache(maxsize=None)
+def format_insert_query(table, columns):
+    """
+    Build a parameterised insert query. Tables and column tuples repeat, so each query is only built once.
+    :param table:
+    :param columns: (tuple) Column names
+    :return: (str)
+    """
+
+    formatted_columns = ','.join(columns)
+
+    data_format = ','.join(['%s'] * len(columns))
+
+    return 'INSERT INTO `{}` ({}) VALUES ({})'.format(table, formatted_columns, data_format)
+
+
 class Database:
     """
     The database object.
@@ -56,19 +73,49 @@ class Database:
         """
         columns, data = zip(*tuples)
 
-        formatted_columns = ','.join(columns)
+        self.insert_values_query(table, columns, data)
 
-        data_format = ','.join(['%s'] * len(columns))
+    def insert_values_query(self, table, columns, values):
+        """
+        Execute an insert query for one row given as values in column order.
+        :param table:
+        :param columns: (tuple) Column names
+        :param values: (tuple) Values in column order
+        :return:
+        """
 
-        query = 'INSERT INTO `{}` ({}) VALUES ({})'.format(table, formatted_columns, data_format)
+        with closing(self.connection.cursor()) as cursor:
+
+            try:
+
+                cursor.execute(format_insert_query(table, columns), values)
+                self.connection.commit()
+
+            except (OperationalError, ProgrammingError) as e:
+
+                self.connection.rollback()
+
+                if self.logger:
+                    self.logger.debug(e)
+
+    def insert_many_query(self, table, columns, rows):
+        """
+        Execute a batched insert query with one row per tuple of values.
+        :param table:
+        :param columns: (tuple) Column names
+        :param rows: (list(tuple)) Values in column order
+        :return: (bool) True if the rows were committed
+        """
 
         with closing(self.connection.cursor()) as cursor:
 
             try:
 
-                cursor.execute(query, data)
+                cursor.executemany(format_insert_query(table, columns), rows)
                 self.connection.commit()
 
+                return True
+
             except (OperationalError, ProgrammingError) as e:
 
                 self.connection.rollback()
@@ -76,6 +123,8 @@ class Database:
                 if self.logger:
                     self.logger.debug(e)
 
+                return False
+
     def insert_transaction_query(self, entries):
         """
         Execute multiple insert queries in a single transaction
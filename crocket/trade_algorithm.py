@@ -73,7 +73,7 @@ def run_algorithm(data, status, buy_amount, order_queue, logger,
     # Action if have bought coin
     else:
 
-        if status.buy_order.status != OrderStatus.COMPLETED.name:
+        if status.buy_order.status != OrderStatus.COMPLETED:
             logger.error('Tradebot: Checking sell order when buy order still in progress: {}.'.format(market))
             return
 
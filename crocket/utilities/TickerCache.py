@@ -0,0 +1,33 @@
+from time import monotonic
+
+
+class TickerCache:
+    """
+    Short-lived cache of ticker results per market
+    """
+
+    def __init__(self,
+                 ttl=2):
+
+        self.ttl = ttl
+        self._tickers = {}
+
+    def get(self, market, fetch):
+        """
+        Get ticker for market, calling fetch only if the cached ticker is older than ttl
+        :param market: Name of market
+        :param fetch: Function returning the current ticker (Ex: bittrex.get_ticker_or_else)
+        :return: (dict) Ticker
+        """
+
+        fetched_time, ticker = self._tickers.get(market, (None, None))
+        now = monotonic()
+
+        if fetched_time is not None and now - fetched_time < self.ttl:
+            return ticker
+
+        # Exceptions from fetch propagate and nothing is cached
+        ticker = fetch(market)
+        self._tickers[market] = (now, ticker)
+
+        return ticker
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 from decimal import Decimal
 
 
@@ -8,7 +8,7 @@ class OrderType(Enum):
     SELL = 2
 
 
-class OrderStatus(Enum):
+class OrderStatus(IntEnum):
 
     UNEXECUTED = 1
     EXECUTED = 2
@@ -20,3 +20,4 @@ class BittrexConstants:
 
     MARKET = 'market'
     DIGITS = Decimal('1e-8')
+    SATOSHI = 10 ** 8
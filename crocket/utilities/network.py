@@ -1,3 +1,10 @@
+from random import random
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 def configure_ip(ip):
     return {
@@ -6,10 +13,21 @@ def configure_ip(ip):
     }
 
 
+def backoff(attempt, base=1.0, cap=60.0):
+    """
+    Exponential backoff delay with jitter for retrying API calls.
+    :param attempt: (int) Number of failed attempts so far (0 for the first retry)
+    :param base: Delay in seconds for the first retry
+    :param cap: Maximum delay in seconds before jitter
+    :return: (float) Seconds to wait
+    """
+    return min(cap, base * 2 ** attempt) * (0.5 + random() / 2)
+
+
 def process_response(session, response):
 
     try:
-        response.data = response.json()
+        response.data = json_loads(response.content)
 
     except:
         response.data = {
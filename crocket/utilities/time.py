@@ -1,4 +1,12 @@
 from datetime import datetime, timezone
+from functools import lru_cache
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = None
+
+BITTREX_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
 
 
 def format_time(datetime_to_format, time_format="%Y-%m-%d %H:%M:%S.%f"):
@@ -10,19 +18,42 @@ def format_time(datetime_to_format, time_format="%Y-%m-%d %H:%M:%S.%f"):
     return datetime_to_format.strftime(time_format)
 
 
-def convert_bittrex_timestamp_to_datetime(timestamp, time_format="%Y-%m-%dT%H:%M:%S.%f"):
+@lru_cache(maxsize=4096)
+def convert_bittrex_timestamp_to_datetime(timestamp, time_format=BITTREX_TIME_FORMAT):
     """
     Convert timestamp string to datetime.
+    Bittrex timestamps (Ex: 2017-08-31T01:29:50.427) are parsed with ciso8601 when it is installed,
+    otherwise sliced directly instead of parsed with strptime.
+    Results are cached since trades on busy markets share timestamps and entries are re-read across polls.
     :param timestamp:
     :param time_format:
     :return:
     """
-    try:
-        converted_datetime = datetime.strptime(timestamp, time_format)
-    except ValueError:
-        converted_datetime = datetime.strptime('{}.0'.format(timestamp), time_format)
+    if time_format != BITTREX_TIME_FORMAT:
+        try:
+            return datetime.strptime(timestamp, time_format)
+        except ValueError:
+            return datetime.strptime('{}.0'.format(timestamp), time_format)
+
+    if parse_datetime is not None:
+        return parse_datetime(timestamp)
+
+    # Fractional seconds are optional and may have fewer than 6 digits
+    fraction = timestamp[20:26]
+
+    return datetime(int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+                    int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]),
+                    int(fraction.ljust(6, '0')) if fraction else 0)
 
-    return converted_datetime
+
+@lru_cache(maxsize=4096)
+def convert_bittrex_timestamp_to_local(timestamp):
+    """
+    Convert Bittrex (UTC) timestamp string to local datetime.
+    :param timestamp:
+    :return:
+    """
+    return convert_bittrex_timestamp_to_datetime(timestamp).replace(tzinfo=timezone.utc).astimezone(tz=None)
 
 
 def utc_to_local(utc_dt):